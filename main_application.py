@@ -4,28 +4,66 @@ Orchestrates all components to process and rank resumes
 """
 
 import os
+import hashlib
+import logging
 from pathlib import Path
 from typing import List, Dict
 import time
 from tqdm import tqdm
 import json
 
-# Import custom modules
-from resume_scanner.resume_parser import ResumeParser
-from resume_scanner.job_analyzer import JobAnalyzer
-from resume_scanner.matching_engine import MatchingEngine
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Import custom modules (the parser, analyzer and matching engine pull in
+# PDF/DOCX and ML libraries, so they are imported on first use)
 from resume_scanner.database_manager import DatabaseManager
+from resume_scanner.config import LOGGING_CONFIG, PARSER_VERSION, PARSING_CONFIG, PERFORMANCE_CONFIG
+
+def _hash_file(file_path) -> str:
+    """SHA-256 of a file, read in 1 MiB blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
 
 class ResumeScreener:
     def __init__(self, db_path: str = 'resume_screener.db'):
         """Initialize the resume screening system"""
-        self.parser = ResumeParser()
-        self.job_analyzer = JobAnalyzer()
-        self.matching_engine = MatchingEngine()
+        self._parser = None
+        self._job_analyzer = None
+        self._matching_engine = None
         self.db = DatabaseManager(db_path)
         
         print("✓ Resume Screener initialized successfully")
     
+    @property
+    def parser(self):
+        """Resume parser, created on first use"""
+        if self._parser is None:
+            from resume_scanner.resume_parser import ResumeParser
+            self._parser = ResumeParser()
+        return self._parser
+    
+    @property
+    def job_analyzer(self):
+        """Job description analyzer, created on first use"""
+        if self._job_analyzer is None:
+            from resume_scanner.job_analyzer import JobAnalyzer
+            self._job_analyzer = JobAnalyzer()
+        return self._job_analyzer
+    
+    @property
+    def matching_engine(self):
+        """Matching engine, created on first use"""
+        if self._matching_engine is None:
+            from resume_scanner.matching_engine import MatchingEngine
+            self._matching_engine = MatchingEngine()
+        return self._matching_engine
+    
     def add_job_posting(self, title: str, description: str) -> int:
         """Add a new job posting and analyze it"""
         print(f"\n📋 Analyzing job posting: {title}")
@@ -50,15 +88,77 @@ class ResumeScreener:
         
         return job_id
     
-    def process_resume(self, file_path: str) -> Dict:
-        """Process a single resume"""
+    def _lookup_cached_parse(self, file_hash: str, file_path):
+        """Return a resume's cache key and its cached parse, if any"""
+        # Keyed on the file's SHA-256 and the parser version that produced it
+        cache_key = f"{file_hash}:{PARSER_VERSION}"
+        resume_data = self.db.get_cached_parse(cache_key)
+        if resume_data:
+            resume_data['file_path'] = str(file_path)
+        return cache_key, resume_data
+    
+    def _store_cached_parse(self, cache_key: str, resume_data: Dict, commit: bool = True):
+        """Cache a parse, unless text extraction failed and should be retried"""
+        if cache_key and resume_data and resume_data.get('raw_text', '').strip():
+            self.db.put_cached_parse(cache_key, resume_data, commit=commit)
+    
+    def process_resume(self, file_path: str, commit: bool = True) -> Dict:
+        """Process a single resume, reusing the cached parse of identical files"""
         try:
-            resume_data = self.parser.parse_resume(file_path)
+            # Read the file once; the same buffer feeds the hash and the parser
+            file_path = Path(file_path)
+            data = file_path.read_bytes()
+            
+            cache_key = None
+            if PERFORMANCE_CONFIG['enable_caching']:
+                cache_key, resume_data = self._lookup_cached_parse(hashlib.sha256(data).hexdigest(), file_path)
+                if resume_data:
+                    return resume_data
+            
+            resume_data = self.parser.parse_resume_bytes(data, file_path.suffix, file_path)
+            self._store_cached_parse(cache_key, resume_data, commit=commit)
             return resume_data
         except Exception as e:
             print(f"Error processing {file_path}: {e}")
             return None
     
+    def _parse_resumes(self, resume_files: List[Path]):
+        """Yield parsed resumes in order, using worker processes if enabled"""
+        workers = PERFORMANCE_CONFIG['max_workers']
+        if not PERFORMANCE_CONFIG['parallel_processing'] or workers < 2 or len(resume_files) < 2:
+            for file_path in resume_files:
+                yield self.process_resume(file_path, commit=False)
+            return
+        
+        # Resolve cache hits here, hashing each file as a stream, and send the
+        # workers only the paths of the misses, so memory use doesn't grow with
+        # the folder. An unreadable file counts as a failed parse, as in the
+        # serial path
+        lookups = []  # (cache_key, resume_data, parsed_by_worker) per file
+        misses = []
+        for file_path in resume_files:
+            cache_key, resume_data = None, None
+            if PERFORMANCE_CONFIG['enable_caching']:
+                try:
+                    file_hash = _hash_file(file_path)
+                except OSError as e:
+                    print(f"Error processing {file_path}: {e}")
+                    lookups.append((None, None, False))
+                    continue
+                cache_key, resume_data = self._lookup_cached_parse(file_hash, file_path)
+            if resume_data is None:
+                misses.append(file_path)
+            lookups.append((cache_key, resume_data, resume_data is None))
+        
+        chunksize = max(1, len(misses) // (4 * workers))
+        parsed = self.parser.iter_parse_resumes(misses, max_workers=workers, chunksize=chunksize)
+        for cache_key, resume_data, parsed_by_worker in lookups:
+            if parsed_by_worker:
+                resume_data = next(parsed)
+                self._store_cached_parse(cache_key, resume_data, commit=False)
+            yield resume_data
+        parsed.close()
+    
     def batch_process_resumes(self, resume_folder: str) -> List[Dict]:
         """Process all resumes in a folder"""
         resume_folder = Path(resume_folder)
@@ -67,28 +167,42 @@ class ResumeScreener:
             print(f"❌ Folder not found: {resume_folder}")
             return []
         
-        # Find all resume files
-        resume_files = []
-        for ext in ['*.pdf', '*.docx', '*.doc']:
-            resume_files.extend(resume_folder.glob(ext))
+        # Find all resume files in a single directory scan
+        extensions = set(PARSING_CONFIG['supported_formats'])
+        with os.scandir(resume_folder) as entries:
+            resume_files = [
+                Path(entry.path) for entry in entries
+                if entry.is_file()
+                and os.path.splitext(entry.name)[1].lower() in extensions
+            ]
         
         print(f"\n📂 Found {len(resume_files)} resumes to process")
         
         processed_resumes = []
+        seen_resume_ids = set()
         
-        # Process each resume with progress bar
-        for file_path in tqdm(resume_files, desc="Processing resumes"):
-            resume_data = self.process_resume(file_path)
-            if resume_data:
-                # Insert into database
-                resume_id = self.db.insert_resume(resume_data)
-                resume_data['resume_id'] = resume_id
-                
-                # Insert skills
-                if resume_data.get('skills'):
-                    self.db.insert_candidate_skills(resume_id, resume_data['skills'])
-                
-                processed_resumes.append(resume_data)
+        # Parse resumes (in parallel if enabled) and insert the results from
+        # this process, committing all inserts as a single transaction
+        parsed_resumes = self._parse_resumes(resume_files)
+        try:
+            for resume_data in tqdm(parsed_resumes, total=len(resume_files), desc="Processing resumes"):
+                if resume_data:
+                    # Insert into database (duplicates resolve to the stored resume)
+                    resume_id = self.db.insert_resume(resume_data, commit=False)
+                    if resume_id in seen_resume_ids:
+                        continue
+                    seen_resume_ids.add(resume_id)
+                    resume_data['resume_id'] = resume_id
+                    
+                    # Insert skills
+                    if resume_data.get('skills'):
+                        self.db.insert_candidate_skills(resume_id, resume_data['skills'], commit=False)
+                    
+                    processed_resumes.append(resume_data)
+            self.db.conn.commit()
+        except Exception:
+            self.db.conn.rollback()
+            raise
         
         print(f"✓ Successfully processed {len(processed_resumes)} resumes")
         return processed_resumes
@@ -111,31 +225,38 @@ class ResumeScreener:
             print("⚠️  Please provide resumes list")
             return
         
-        # Delete existing rankings for this job
-        self.db.delete_rankings_for_job(job_id)
-        
-        # Rank all resumes
-        print("Calculating match scores...")
-        ranked_resumes = self.matching_engine.rank_resumes(resumes, job_data)
-        
-        # Insert rankings into database
-        print("Saving rankings to database...")
-        for resume, scores, rank in tqdm(ranked_resumes, desc="Saving rankings"):
-            ranking_data = {
-                'job_id': job_id,
-                'resume_id': resume['resume_id'],
-                'overall_score': scores['overall_score'],
-                'skills_score': scores['skills_score'],
-                'experience_score': scores['experience_score'],
-                'education_score': scores['education_score'],
-                'semantic_score': scores['semantic_score'],
-                'rank_position': rank
+        # Delete existing rankings for this job and insert the new ones as a
+        # single transaction, so a failed re-rank keeps the old rankings
+        try:
+            self.db.delete_rankings_for_job(job_id, commit=False)
+            
+            # Rank all resumes in one pass so semantic scores are computed as a batch
+            print("Calculating match scores...")
+            job_requirements = {
+                'title': job_data['title'],
+                'description': job_data['description'],
+                'required_skills': job_data['requiredskills'],
+                'preferred_skills': job_data['preferredskills'],
+                'min_experience': job_data['minexperience'],
+                'education_requirement': job_data['educationlevel']
             }
-            self.db.insert_resume_ranking(ranking_data)
+            batch = self.matching_engine.rank_resumes_batch(resumes, job_requirements)
+            
+            # Insert rankings into database straight from the score arrays
+            print("Saving rankings to database...")
+            n = len(batch.indices)
+            resume_ids = [resumes[i]['resume_id'] for i in batch.indices.tolist()]
+            rows = list(zip([job_id] * n, resume_ids, batch.overall.tolist(), batch.skills.tolist(),
+                            batch.experience.tolist(), batch.education.tolist(),
+                            batch.semantic.tolist(), range(1, n + 1)))
+            self.db.insert_resume_rankings_bulk(rows)
+        except Exception:
+            self.db.conn.rollback()
+            raise
         
-        print(f"✓ Ranked {len(ranked_resumes)} resumes")
+        print(f"✓ Ranked {n} resumes")
         
-        return ranked_resumes
+        return batch
     
     def get_top_candidates(self, job_id: int, top_n: int = 10) -> List[Dict]:
         """Get top N candidates for a job"""
@@ -177,22 +298,24 @@ class ResumeScreener:
     def generate_report(self, job_id: int, output_file: str = 'screening_report.json'):
         """Generate comprehensive screening report"""
         job_data = self.db.get_job_posting(job_id)
-        all_rankings = self.db.get_all_rankings_for_job(job_id)
+        
+        # Aggregate in SQL rather than loading every ranking into memory
+        stats = self.db.get_ranking_stats(job_id)
+        total_candidates = stats.pop('total_candidates')
         
         report = {
             'job_info': job_data,
-            'total_candidates': len(all_rankings),
+            'total_candidates': total_candidates,
             'screening_date': time.strftime('%Y-%m-%d %H:%M:%S'),
-            'top_10_candidates': all_rankings[:10],
-            'statistics': {
-                'avg_overall_score': sum(r['overall_score'] for r in all_rankings) / len(all_rankings),
-                'avg_skills_score': sum(r['skills_score'] for r in all_rankings) / len(all_rankings),
-                'avg_experience_score': sum(r['experience_score'] for r in all_rankings) / len(all_rankings),
-            }
+            'top_10_candidates': self.db.get_top_candidates(job_id, 10),
+            'statistics': stats
         }
         
-        with open(output_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        if orjson is not None:
+            Path(output_file).write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w') as f:
+                json.dump(report, f, indent=2)
         
         print(f"✓ Report generated: {output_file}")
         return report
@@ -201,11 +324,26 @@ class ResumeScreener:
         """Close database connection"""
         self.db.close()
 
+def setup_logging():
+    """Configure logging from LOGGING_CONFIG"""
+    if not LOGGING_CONFIG['enabled']:
+        logging.disable(logging.CRITICAL)
+        return
+    
+    handlers = []
+    if LOGGING_CONFIG['log_to_console']:
+        handlers.append(logging.StreamHandler())
+    if LOGGING_CONFIG['log_file']:
+        handlers.append(logging.FileHandler(LOGGING_CONFIG['log_file']))
+    logging.basicConfig(level=LOGGING_CONFIG['level'], handlers=handlers)
+
 # ==================== EXAMPLE USAGE ====================
 
 def main():
     """Example workflow"""
     
+    setup_logging()
+    
     # Initialize screener
     screener = ResumeScreener()
     
@@ -0,0 +1,83 @@
+"""
+Shared Skill Vocabulary
+Technical and soft skills recognized in resumes and job descriptions,
+built once at import time
+"""
+
+import re
+
+# Canonical skill lists; order within each category is the reporting order
+SKILLS_BY_CATEGORY = {
+    'programming': (
+        'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php',
+        'swift', 'kotlin', 'go', 'rust', 'typescript', 'scala', 'r'
+    ),
+    'web': (
+        'html', 'css', 'react', 'angular', 'vue', 'node.js', 'django',
+        'flask', 'spring', 'asp.net', 'express', 'jquery', 'bootstrap',
+        'rest api', 'microservices'
+    ),
+    'database': (
+        'sql', 'mysql', 'postgresql', 'mongodb', 'oracle', 'redis',
+        'cassandra', 'dynamodb', 'sqlite', 'mariadb', 'nosql'
+    ),
+    'cloud': (
+        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins',
+        'terraform', 'ansible', 'git', 'ci/cd', 'devops'
+    ),
+    'data_science': (
+        'machine learning', 'deep learning', 'nlp', 'tensorflow',
+        'pytorch', 'scikit-learn', 'pandas', 'numpy', 'matplotlib',
+        'tableau', 'power bi', 'spark', 'hadoop', 'data analysis'
+    ),
+    'soft_skills': (
+        'leadership', 'communication', 'teamwork', 'problem solving',
+        'analytical', 'project management', 'agile', 'scrum'
+    )
+}
+
+# Inverted index and reporting position of every skill
+SKILL_TO_CATEGORY = {
+    skill: category
+    for category, skills in SKILLS_BY_CATEGORY.items()
+    for skill in skills
+}
+SKILL_RANK = {skill: i for i, skill in enumerate(SKILL_TO_CATEGORY)}
+SKILLS = frozenset(SKILL_TO_CATEGORY)
+
+# Skill names that are also everyday English ("go the extra mile", "Spring
+# 2025 start"). Resumes list skills, so the parser keeps them; job postings
+# are prose, so the analyzer only looks for the unambiguous rest
+AMBIGUOUS_SKILLS = frozenset({'go', 'r', 'express', 'spring', 'swift'})
+JOB_SKILLS = SKILLS - AMBIGUOUS_SKILLS
+
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def _compile_scanner(skills):
+    # Plain-word skills are found by intersecting them with the text's word
+    # tokens. Punctuated or multi-word skills (c++, node.js, machine learning)
+    # each get a pattern that leads with the literal, so re can jump straight
+    # to candidates; the lookbehind after it checks the preceding character
+    words = frozenset(skill for skill in skills if _WORD_RE.fullmatch(skill))
+    phrases = tuple(
+        (skill, re.compile(re.escape(skill) + r'(?<!\w' + re.escape(skill) + r')(?!\w)'))
+        for skill in sorted(skills - words)
+    )
+    return words, phrases
+
+
+SKILL_SCANNER = _compile_scanner(SKILLS)
+JOB_SKILL_SCANNER = _compile_scanner(JOB_SKILLS)
+
+
+def find_skills(text_lower, scanner=SKILL_SCANNER):
+    """Skills occurring in lowercased text, bounded by non-word characters"""
+    words, phrases = scanner
+    found = set(words.intersection(_WORD_RE.findall(text_lower)))
+    found.update(
+        skill for skill, pattern in phrases
+        if skill in text_lower and pattern.search(text_lower)
+    )
+    return found
@@ -111,6 +111,10 @@ PARSING_CONFIG = {
     'ocr_enabled': False,     # Enable OCR for scanned PDFs (requires additional setup)
 }
 
+# Part of the parse cache key: bump whenever ResumeParser output changes so
+# resumes parsed by an older version are parsed again
+PARSER_VERSION = 2
+
 # ==================== MATCHING SETTINGS ====================
 MATCHING_CONFIG = {
     'min_match_threshold': 0.0,  # Minimum score to consider (0.0 = all candidates)
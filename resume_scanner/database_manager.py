@@ -1,15 +1,75 @@
 import sqlite3
+import csv
 import json
-from typing import List, Dict, Optional
+import logging
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+import hashlib
+import copy
 import os
 
+from resume_scanner.config import ADVANCED_FEATURES
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema.sql")
+
+# Tables and indexes defined in schema.sql
+SCHEMA_OBJECTS = (
+    'jobpostings', 'resumes', 'resumerankings', 'jobskills', 'candidateskills',
+    'resumecache', 'idx_rankings_job_rank', 'idx_rankings_job_score',
+    'idx_resume_hash', 'idx_candidateskills_resume_skill'
+)
+
+# Columns added after the first release, backfilled into older databases
+# before schema.sql creates indexes on them
+ADDED_COLUMNS = {
+    'resumes': {'contenthash': 'INTEGER'},
+    'resumerankings': {
+        'skillsscore': 'REAL', 'experiencescore': 'REAL', 'educationscore': 'REAL',
+        'semanticscore': 'REAL', 'rankposition': 'INTEGER'
+    },
+}
+
+
+def _content_hash(text: str) -> Optional[int]:
+    # 64-bit hash of the whitespace/case-normalized text, signed to fit SQLite
+    # INTEGER. Empty text (a failed extraction) gets no hash, so unreadable
+    # files are never merged; the UNIQUE index allows any number of NULLs
+    normalized = ' '.join(text.split()).lower().encode('utf-8')
+    if not normalized:
+        return None
+    # Always blake2b: the hash is persisted, so it must not depend on which
+    # optional packages are installed
+    digest = hashlib.blake2b(normalized, digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def _json_dumps(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _json_loads(text: str):
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
 
 class DatabaseManager:
     def __init__(self, dbpath: str = "resumescreener.db"):
         self.dbpath = dbpath
         self.conn = None
         self.cursor = None
+        # Parsed job postings keyed by jobid, evicted whenever a job changes
+        self._job_cache: Dict[int, Dict] = {}
         self.connect()
         self.create_tables()
 
@@ -17,38 +77,68 @@ class DatabaseManager:
         try:
             self.conn = sqlite3.connect(self.dbpath)
             self.conn.row_factory = sqlite3.Row
+            self.conn.executescript('''
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA cache_size=-65536;
+                PRAGMA mmap_size=268435456;
+            ''')
             self.cursor = self.conn.cursor()
-            print(f"Connected to database at {self.dbpath}")
+            logger.debug("Connected to database at %s", self.dbpath)
         except Exception as e:
-            print(f"Failed to connect to database: {e}")
+            logger.error("Failed to connect to database: %s", e)
             raise
 
+    def _raw_cursor(self):
+        # Plain tuple rows for bulk reads that don't need sqlite3.Row access
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        return cursor
+
     def create_tables(self):
-        schemafile = "schema.sql"
+        # Skip reading and running the schema when it is already in place
+        placeholders = ", ".join("?" for _ in SCHEMA_OBJECTS)
+        query = f"SELECT COUNT(*) FROM sqlite_master WHERE name IN ({placeholders})"
+        if self.conn.execute(query, SCHEMA_OBJECTS).fetchone()[0] == len(SCHEMA_OBJECTS):
+            logger.debug("Database tables verified successfully.")
+            return
+
+        schemafile = SCHEMA_FILE
         if not os.path.exists(schemafile):
-            print(f"Error: schema.sql file not found. Cannot create tables.")
+            logger.error("schema.sql file not found. Cannot create tables.")
             return
         try:
             with open(schemafile, "r") as f:
                 schema = f.read()
+            self._add_missing_columns()
             self.conn.executescript(schema)
             self.conn.commit()
-            print("Database tables created or verified successfully.")
+            logger.debug("Database tables created or verified successfully.")
         except sqlite3.OperationalError as e:
-            print(f"SQLite Operational Error during table creation: {e}")
-            print("Check your schema.sql file for syntax errors.")
+            logger.error("SQLite Operational Error during table creation: %s", e)
+            logger.error("Check your schema.sql file for syntax errors.")
             raise e
         except Exception as e:
-            print(f"Unexpected error during table creation: {e}")
+            logger.error("Unexpected error during table creation: %s", e)
             raise e
 
+    def _add_missing_columns(self):
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            if not existing:
+                continue
+            for column, columntype in columns.items():
+                if column not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {columntype}")
+
     def insert_job_posting(self, jobdata: Dict) -> int:
         query = '''INSERT INTO jobpostings 
                    (title, description, requiredskills, preferredskills, minexperience, educationlevel)
                    VALUES (?, ?, ?, ?, ?, ?)'''
         try:
-            required = json.dumps(jobdata.get('required_skills', []))
-            preferred = json.dumps(jobdata.get('preferred_skills', []))
+            required = _json_dumps(jobdata.get('required_skills', []))
+            preferred = _json_dumps(jobdata.get('preferred_skills', []))
             minexp = jobdata.get('min_experience', 0)
             education = jobdata.get('education_requirement', 'not_specified')
             self.cursor.execute(query, (
@@ -61,10 +151,11 @@ class DatabaseManager:
             ))
             self.conn.commit()
             jobid = self.cursor.lastrowid
-            print(f"Job inserted with ID: {jobid}")
+            self._job_cache.pop(jobid, None)
+            logger.debug("Job inserted with ID: %s", jobid)
             return jobid
         except Exception as e:
-            print(f"Error inserting job posting: {e}")
+            logger.error("Error inserting job posting: %s", e)
             raise
 
     def insert_job_skills(self, jobid: int, requiredskills: List[str], preferredskills: List[str]):
@@ -73,41 +164,203 @@ class DatabaseManager:
             INSERT INTO jobskills (jobid, skillname, isrequired, weight)
             VALUES (?, ?, ?, ?)
             '''
-            for skill in requiredskills:
-                self.cursor.execute(query, (jobid, skill, True, 1.0))
-            for skill in preferredskills:
-                self.cursor.execute(query, (jobid, skill, False, 0.5))
+            rows = ([(jobid, skill, True, 1.0) for skill in requiredskills] +
+                    [(jobid, skill, False, 0.5) for skill in preferredskills])
+            self.cursor.executemany(query, rows)
             self.conn.commit()
-            print(f"Inserted skills for job ID: {jobid}")
+            self._job_cache.pop(jobid, None)
+            logger.debug("Inserted skills for job ID: %s", jobid)
+        except Exception as e:
+            logger.error("Error inserting job skills: %s", e)
+            raise
+
+    def insert_resume(self, resumedata: Dict, commit: bool = True) -> int:
+        query = '''INSERT INTO resumes
+                   (candidatename, email, phone, filepath, rawtext, extractedskills, yearsexperience, educationlevel, contenthash)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)'''
+        # With duplicate detection off every resume is stored as its own row
+        contenthash = None
+        if ADVANCED_FEATURES['detect_duplicates']:
+            contenthash = _content_hash(resumedata.get('raw_text') or '')
+        try:
+            skills = _json_dumps([s['skill'] for s in resumedata.get('skills', [])])
+            self.cursor.execute(query, (
+                resumedata.get('candidate_name'),
+                resumedata.get('email'),
+                resumedata.get('phone'),
+                resumedata.get('file_path'),
+                resumedata.get('raw_text'),
+                skills,
+                resumedata.get('years_experience', 0),
+                resumedata.get('education_level', 'unknown'),
+                contenthash
+            ))
+            if commit:
+                self.conn.commit()
+            return self.cursor.lastrowid
+        except sqlite3.IntegrityError:
+            # Same resume text already stored: reuse the existing record
+            self.cursor.execute('SELECT resumeid FROM resumes WHERE contenthash = ?', (contenthash,))
+            resumeid = self.cursor.fetchone()[0]
+            logger.debug("Duplicate of resume ID: %s", resumeid)
+            return resumeid
         except Exception as e:
-            print(f"Error inserting job skills: {e}")
+            logger.error("Error inserting resume: %s", e)
+            raise
+
+    def insert_candidate_skills(self, resumeid: int, skills: List[Dict], commit: bool = True):
+        try:
+            query = '''
+            INSERT OR IGNORE INTO candidateskills (resumeid, skillname, category)
+            VALUES (?, ?, ?)
+            '''
+            rows = [(resumeid, s['skill'], s.get('category')) for s in skills]
+            self.cursor.executemany(query, rows)
+            if commit:
+                self.conn.commit()
+        except Exception as e:
+            logger.error("Error inserting candidate skills: %s", e)
             raise
 
     def get_job_posting(self, jobid: int) -> Optional[Dict]:
+        # Deep copies, so callers editing the skill lists can't corrupt the cache
+        if jobid in self._job_cache:
+            return copy.deepcopy(self._job_cache[jobid])
         query = '''SELECT * FROM jobpostings WHERE jobid = ?'''
         try:
             self.cursor.execute(query, (jobid,))
             row = self.cursor.fetchone()
             if row:
                 job = dict(row)
-                job['requiredskills'] = json.loads(job.get('requiredskills', '[]'))
-                job['preferredskills'] = json.loads(job.get('preferredskills', '[]'))
-                print(f"Fetched job posting with ID: {jobid}")
-                return job
+                job['requiredskills'] = _json_loads(job.get('requiredskills', '[]'))
+                job['preferredskills'] = _json_loads(job.get('preferredskills', '[]'))
+                self._job_cache[jobid] = job
+                logger.debug("Fetched job posting with ID: %s", jobid)
+                return copy.deepcopy(job)
             else:
-                print(f"No job posting found with ID: {jobid}")
+                logger.debug("No job posting found with ID: %s", jobid)
                 return None
         except Exception as e:
-            print(f"Error fetching job posting: {e}")
+            logger.error("Error fetching job posting: %s", e)
+            raise
+
+    def delete_rankings_for_job(self, jobid: int, commit: bool = True):
+        try:
+            self.cursor.execute('DELETE FROM resumerankings WHERE jobid = ?', (jobid,))
+            if commit:
+                self.conn.commit()
+        except Exception as e:
+            logger.error("Error deleting rankings: %s", e)
+            raise
+
+    def insert_resume_rankings_bulk(self, rows: List[Tuple]):
+        # Rows are (jobid, resumeid, overall, skills, experience, education, semantic, rank)
+        query = '''INSERT INTO resumerankings
+                   (jobid, resumeid, score, skillsscore, experiencescore, educationscore, semanticscore, rankposition)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)'''
+        try:
+            self.cursor.executemany(query, rows)
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            logger.error("Error inserting resume rankings: %s", e)
+            raise
+
+    def get_top_candidates(self, jobid: int, limit: int = 10) -> List[Dict]:
+        query = '''SELECT rr.rankposition AS rank_position,
+                          r.resumeid AS resume_id,
+                          r.candidatename AS candidate_name,
+                          r.email,
+                          r.phone,
+                          r.yearsexperience AS years_experience,
+                          r.educationlevel AS education_level,
+                          rr.score AS overall_score,
+                          rr.skillsscore AS skills_score,
+                          rr.experiencescore AS experience_score,
+                          rr.educationscore AS education_score,
+                          rr.semanticscore AS semantic_score
+                   FROM resumerankings rr
+                   JOIN resumes r ON r.resumeid = rr.resumeid
+                   WHERE rr.jobid = ?
+                   ORDER BY rr.rankposition
+                   LIMIT ?'''
+        try:
+            self.cursor.execute(query, (jobid, limit))
+            return [dict(row) for row in self.cursor.fetchall()]
+        except Exception as e:
+            logger.error("Error fetching top candidates: %s", e)
+            raise
+
+    def get_ranking_stats(self, jobid: int) -> Dict:
+        query = '''SELECT COUNT(*) AS total_candidates,
+                          AVG(score) AS avg_overall_score,
+                          AVG(skillsscore) AS avg_skills_score,
+                          AVG(experiencescore) AS avg_experience_score
+                   FROM resumerankings WHERE jobid = ?'''
+        try:
+            cursor = self._raw_cursor()
+            cursor.execute(query, (jobid,))
+            return dict(zip([column[0] for column in cursor.description], cursor.fetchone()))
+        except Exception as e:
+            logger.error("Error fetching ranking statistics: %s", e)
+            raise
+
+    def export_rankings_to_csv(self, jobid: int, outputfile: str):
+        query = '''SELECT rr.rankposition AS rank_position,
+                          r.candidatename AS candidate_name,
+                          r.email,
+                          r.phone,
+                          r.yearsexperience AS years_experience,
+                          r.educationlevel AS education_level,
+                          rr.score AS overall_score,
+                          rr.skillsscore AS skills_score,
+                          rr.experiencescore AS experience_score,
+                          rr.educationscore AS education_score,
+                          rr.semanticscore AS semantic_score
+                   FROM resumerankings rr
+                   JOIN resumes r ON r.resumeid = rr.resumeid
+                   WHERE rr.jobid = ?
+                   ORDER BY rr.rankposition'''
+        try:
+            # Stream rows straight from the cursor into a buffered file
+            cursor = self._raw_cursor()
+            cursor.execute(query, (jobid,))
+            with open(outputfile, 'w', newline='', buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow([column[0] for column in cursor.description])
+                writer.writerows(cursor)
+        except Exception as e:
+            logger.error("Error exporting rankings: %s", e)
+            raise
+
+    def get_cached_parse(self, filehash: str) -> Optional[Dict]:
+        query = '''SELECT parsedjson FROM resumecache WHERE filehash = ?'''
+        try:
+            self.cursor.execute(query, (filehash,))
+            row = self.cursor.fetchone()
+            return _json_loads(row['parsedjson']) if row else None
+        except Exception as e:
+            logger.error("Error fetching cached resume: %s", e)
+            raise
+
+    def put_cached_parse(self, filehash: str, resumedata: Dict, commit: bool = True):
+        query = '''INSERT OR REPLACE INTO resumecache (filehash, parsedjson) VALUES (?, ?)'''
+        try:
+            self.cursor.execute(query, (filehash, _json_dumps(resumedata)))
+            if commit:
+                self.conn.commit()
+        except Exception as e:
+            logger.error("Error caching parsed resume: %s", e)
             raise
 
     def close(self):
         if self.conn:
             self.conn.close()
-            print("Database connection closed.")
+            logger.debug("Database connection closed.")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
     try:
         db = DatabaseManager()
 
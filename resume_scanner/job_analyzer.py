@@ -5,12 +5,15 @@ Extracts requirements and key information from job descriptions
 """
 
 import re
+import copy
 import json
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
+
+from resume_scanner._skills import JOB_SKILL_SCANNER, JOB_SKILLS, find_skills
 
 class JobAnalyzer:
     def __init__(self):
-        self.skills_keywords = self._load_skills_keywords()
+        self.skills_keywords = JOB_SKILLS
         self.experience_keywords = ['experience', 'years', 'yrs']
         self.education_keywords = {
             'phd': 5,
@@ -19,118 +22,143 @@ class JobAnalyzer:
             'associate': 2,
             'high_school': 1
         }
-
-    def _load_skills_keywords(self) -> Set[str]:
-        """Load common technical skills"""
-        return {
-            'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php',
-            'html', 'css', 'react', 'angular', 'vue', 'node.js', 'django',
-            'sql', 'mysql', 'postgresql', 'mongodb', 'oracle', 'nosql',
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins',
-            'machine learning', 'deep learning', 'nlp', 'tensorflow',
-            'agile', 'scrum', 'git', 'ci/cd', 'rest api', 'microservices',
-            'leadership', 'communication', 'project management'
+        # Analyses keyed on (job_title, job_description), oldest evicted first
+        self._analysis_cache: Dict[tuple, Dict] = {}
+        self._analysis_cache_size = 256
+        self.required_section_keywords = ['required', 'requirements', 'must have', 'qualifications']
+        self.preferred_section_keywords = ['preferred', 'nice to have', 'plus', 'bonus']
+
+        # Precompiled patterns reused by every analysis
+        # One pattern per section heading, in priority order
+        self._section_patterns = {
+            kind: [
+                re.compile(rf'(?:^|\n)\s*{re.escape(keyword)}[:\s]+(.*?)(?=\n\s*\n|\Z)', re.IGNORECASE | re.DOTALL)
+                for keyword in keywords
+            ]
+            for kind, keywords in (('required', self.required_section_keywords),
+                                   ('preferred', self.preferred_section_keywords))
+        }
+        self._experience_patterns = [re.compile(p) for p in [
+            r'(\d+)\+?\s*years?\s*(?:of)?\s*experience',
+            r'minimum\s*(?:of)?\s*(\d+)\s*years?',
+            r'at least\s*(\d+)\s*years?',
+            r'(\d+)\+?\s*yrs?'
+        ]]
+        # Education levels, highest first. Plain keywords are checked with
+        # substring tests; re is only used for the word-boundary abbreviations
+        self._education_literals = {
+            'phd': ('phd', 'ph.d', 'doctorate', 'doctoral'),
+            'masters': ('master', 'msc', 'mba'),
+            'bachelors': ('bachelor', 'bsc', 'degree'),
+            'associate': ('associate', 'diploma'),
         }
+        self._education_res = {
+            'masters': re.compile(r'ms\b|ma\b'),
+            'bachelors': re.compile(r'bs\b|ba\b'),
+        }
+        self._key_phrase_patterns = [re.compile(p) for p in [
+            r'strong ([\w\s-]+)',
+            r'excellent ([\w\s-]+)',
+            r'proven ([\w\s-]+)',
+            r'experience (?:with|in) ([\w\s-]+)',
+            r'knowledge of ([\w\s-]+)',
+        ]]
 
-    def extract_required_skills(self, job_description: str) -> Dict[str, List[str]]:
+    def extract_required_skills(self, job_description: str, text_lower: Optional[str] = None) -> Dict[str, List[str]]:
         """Extract required and preferred skills from job description"""
-        text_lower = job_description.lower()
-        required_skills = []
-        preferred_skills = []
-
-        required_section = self._extract_section(
-            text_lower,
-            ['required', 'requirements', 'must have', 'qualifications']
-        )
-        preferred_section = self._extract_section(
-            text_lower,
-            ['preferred', 'nice to have', 'plus', 'bonus']
-        )
-
-        for skill in self.skills_keywords:
-            if skill.lower() in required_section:
-                required_skills.append(skill)
-            elif skill.lower() in preferred_section:
-                preferred_skills.append(skill)
-            elif skill.lower() in text_lower:
-                if skill not in preferred_skills:
-                    required_skills.append(skill)
-
-        required_skills = [s for s in required_skills if s not in preferred_skills]
+        if text_lower is None:
+            text_lower = job_description.lower()
+
+        required_section = self._extract_section(text_lower, 'required')
+        preferred_section = self._extract_section(text_lower, 'preferred')
+
+        required_found = self._scan_skills(required_section)
+        preferred_found = self._scan_skills(preferred_section)
+
+        # A skill is preferred only if it appears in the preferred section and
+        # not the required one; every other skill mentioned is required
+        preferred_skills = preferred_found - required_found
+        required_skills = (self._scan_skills(text_lower) | required_found) - preferred_skills
 
         return {
-            'required': list(set(required_skills)),
-            'preferred': list(set(preferred_skills))
+            'required': sorted(required_skills),
+            'preferred': sorted(preferred_skills)
         }
 
-    def _extract_section(self, text: str, keywords: List[str]) -> str:
-        """Extract a specific section from job description"""
-        for keyword in keywords:
-            pattern = rf'(?:^|\n)\s*{keyword}[:\s]+(.*?)(?=\n\s*\n|\Z)'
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+    def _scan_skills(self, text: str) -> Set[str]:
+        """Find all known skills in lowercased text"""
+        return find_skills(text, JOB_SKILL_SCANNER)
+
+    def _extract_section(self, text: str, kind: str) -> str:
+        """Extract a specific section ('required' or 'preferred') from job description"""
+        for pattern in self._section_patterns[kind]:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip()
         return ""
 
-    def extract_experience_requirement(self, job_description: str) -> int:
+    def extract_experience_requirement(self, job_description: str, text_lower: Optional[str] = None) -> int:
         """Extract minimum years of experience required"""
-        patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of)?\s*experience',
-            r'minimum\s*(?:of)?\s*(\d+)\s*years?',
-            r'at least\s*(\d+)\s*years?',
-            r'(\d+)\+?\s*yrs?'
-        ]
-        text_lower = job_description.lower()
+        if text_lower is None:
+            text_lower = job_description.lower()
+        # Every pattern needs 'year' or 'yr', so most texts skip the regexes
+        if 'year' not in text_lower and 'yr' not in text_lower:
+            return 0
         years = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text_lower)
+        for pattern in self._experience_patterns:
+            matches = pattern.findall(text_lower)
             years.extend([int(m) for m in matches])
         return min(years) if years else 0
 
-    def extract_education_requirement(self, job_description: str) -> str:
+    def extract_education_requirement(self, job_description: str, text_lower: Optional[str] = None) -> str:
         """Extract education requirement"""
-        text_lower = job_description.lower()
-        education_patterns = {
-            'phd': [r'ph\.?d', r'doctorate', r'doctoral'],
-            'masters': [r'master[\'s]*', r'msc', r'ms\b', r'ma\b', r'mba'],
-            'bachelors': [r'bachelor[\'s]*', r'bsc', r'bs\b', r'ba\b', r'degree'],
-            'associate': [r'associate', r'diploma'],
-        }
-        for level, patterns in education_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    return level
+        if text_lower is None:
+            text_lower = job_description.lower()
+        for level, literals in self._education_literals.items():
+            if any(literal in text_lower for literal in literals):
+                return level
+            pattern = self._education_res.get(level)
+            if pattern is not None and pattern.search(text_lower):
+                return level
         return 'not_specified'
 
-    def identify_key_phrases(self, job_description: str) -> List[str]:
+    def identify_key_phrases(self, job_description: str, text_lower: Optional[str] = None) -> List[str]:
         """Extract key phrases and important terms"""
-        text = job_description.lower()
-        important_patterns = [
-            r'strong ([\w\s-]+)',
-            r'excellent ([\w\s-]+)',
-            r'proven ([\w\s-]+)',
-            r'experience (?:with|in) ([\w\s-]+)',
-            r'knowledge of ([\w\s-]+)',
-        ]
-        key_phrases = []
-        for pattern in important_patterns:
-            matches = re.findall(pattern, text)
-            for m in matches:
-                phrase = m.strip()
+        text = job_description.lower() if text_lower is None else text_lower
+        key_phrases = {}  # Ordered set of phrases
+        # Each pattern starts with a literal, so re can jump between candidate
+        # positions; stop as soon as 20 distinct phrases are found
+        for pattern in self._key_phrase_patterns:
+            for match in pattern.finditer(text):
+                phrase = match.group(1).strip()
                 if 5 < len(phrase) < 50:
-                    key_phrases.append(phrase)
-        return list(set(key_phrases))[:20]
+                    key_phrases[phrase] = None
+                    if len(key_phrases) == 20:
+                        return list(key_phrases)
+        return list(key_phrases)
 
     def analyze_job(self, job_title: str, job_description: str) -> Dict:
-        skills = self.extract_required_skills(job_description)
+        # Copy so callers can't modify the memoized analysis
+        key = (job_title, job_description)
+        analysis = self._analysis_cache.get(key)
+        if analysis is None:
+            if len(self._analysis_cache) >= self._analysis_cache_size:
+                del self._analysis_cache[next(iter(self._analysis_cache))]
+            analysis = self._analysis_cache[key] = self._analyze_job(job_title, job_description)
+        return copy.deepcopy(analysis)
+
+    def _analyze_job(self, job_title: str, job_description: str) -> Dict:
+        # Lowercase once and share the copy with every extractor
+        text_lower = job_description.lower()
+        skills = self.extract_required_skills(job_description, text_lower)
         analysis = {
             'title': job_title,
             'description': job_description,
             'required_skills': sorted(skills['required']),
             'preferred_skills': sorted(skills['preferred']),
-            'min_experience': self.extract_experience_requirement(job_description),
-            'education_requirement': self.extract_education_requirement(job_description),
-            'key_phrases': sorted(self.identify_key_phrases(job_description))
+            'min_experience': self.extract_experience_requirement(job_description, text_lower),
+            'education_requirement': self.extract_education_requirement(job_description, text_lower),
+            'key_phrases': sorted(self.identify_key_phrases(job_description, text_lower))
         }
         return analysis
 
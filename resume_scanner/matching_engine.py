@@ -1,11 +1,38 @@
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import Dict, List, Tuple
+from sklearn.feature_extraction.text import HashingVectorizer
+from typing import Dict, FrozenSet, List, NamedTuple, Tuple
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _batch_score(skill, exp, edu, sem, w):
+        # Weighted total of the score columns, capped at 1.0 (numeric only, no strings)
+        out = np.empty(skill.shape[0])
+        for i in prange(skill.shape[0]):
+            out[i] = min(1.0, skill[i] * w[0] + exp[i] * w[1] + edu[i] * w[2] + sem[i] * w[3])
+        return out
+else:
+    _batch_score = None
+
+class RankingBatch(NamedTuple):
+    """Scores for a batch of resumes as parallel arrays, best match first"""
+    indices: np.ndarray      # Position of each resume in the input list
+    overall: np.ndarray
+    skills: np.ndarray
+    experience: np.ndarray
+    education: np.ndarray
+    semantic: np.ndarray
 
 class MatchingEngine:
     def __init__(self):
-        self.vectorizer = TfidfVectorizer(max_features=500, ngram_range=(1, 2), stop_words='english')
+        # Stateless: tokens hash straight into a fixed-size, L2-normalized vector,
+        # so documents can be scored as they arrive without refitting
+        self.vectorizer = HashingVectorizer(n_features=2**18, ngram_range=(1, 2), stop_words='english',
+                                            alternate_sign=False, norm='l2')
         self.weights = {
             'skills': 0.40,
             'experience': 0.25,
@@ -22,22 +49,26 @@ class MatchingEngine:
         }
 
     def calculate_skill_score(self, resume_skills: List[str], required_skills: List[str], preferred_skills: List[str]) -> float:
-        resume_lower = [s.lower() for s in resume_skills]
-        required_lower = [s.lower() for s in required_skills]
-        preferred_lower = [s.lower() for s in preferred_skills]
+        return self._skill_score(
+            frozenset(s.lower() for s in resume_skills),
+            [s.lower() for s in required_skills],
+            [s.lower() for s in preferred_skills]
+        )
 
-        required_matches = sum(1 for skill in required_lower if skill in resume_lower)
-        preferred_matches = sum(1 for skill in preferred_lower if skill in resume_lower)
+    def _skill_score(self, resume_set: FrozenSet[str], required_lower: List[str], preferred_lower: List[str]) -> float:
+        # Job skills are lowercased once per job; resume skills are a set for O(1) lookups
+        required_matches = sum(1 for skill in required_lower if skill in resume_set)
+        preferred_matches = sum(1 for skill in preferred_lower if skill in resume_set)
 
-        if len(required_skills) == 0:
+        if len(required_lower) == 0:
             required_score = 1.0
         else:
-            required_score = required_matches / len(required_skills)
+            required_score = required_matches / len(required_lower)
 
-        if len(preferred_skills) == 0:
+        if len(preferred_lower) == 0:
             preferred_bonus = 0.0
         else:
-            preferred_bonus = (preferred_matches / len(preferred_skills)) * 0.2  # Preferred adds up to 0.2 bonus
+            preferred_bonus = (preferred_matches / len(preferred_lower)) * 0.2  # Preferred adds up to 0.2 bonus
 
         total_score = min(required_score + preferred_bonus, 1.0)
         return total_score
@@ -45,12 +76,15 @@ class MatchingEngine:
     def calculate_experience_score(self, candidate_experience: float, required_experience: int) -> float:
         if required_experience == 0:
             return 1.0
-        if candidate_experience >= required_experience:
-            # Bonus for extra experience capped at 20% extra
-            bonus = min((candidate_experience - required_experience) / required_experience * 0.2, 0.2)
-            return min(1.0, 1.0 + bonus)
-        else:
-            return candidate_experience / required_experience  # Partial credit
+        # Full credit at or above the requirement, partial credit below it
+        return min(1.0, candidate_experience / required_experience)
+
+    def calculate_experience_score_batch(self, candidate_experience, required_experience) -> np.ndarray:
+        """Experience scores for arrays of candidate and required years"""
+        candidate, required = np.broadcast_arrays(np.asarray(candidate_experience, dtype=float),
+                                                  np.asarray(required_experience, dtype=float))
+        ratio = np.divide(candidate, required, out=np.ones(candidate.shape), where=required != 0)
+        return np.minimum(ratio, 1.0)
 
     def calculate_education_score(self, candidate_education: str, required_education: str) -> float:
         candidate_level = self.education_levels.get(candidate_education.lower(), 0)
@@ -67,17 +101,39 @@ class MatchingEngine:
         else:
             return 0.0
 
+    def vectorize_corpus(self, texts: List[str]):
+        """Hash every text into one sparse matrix (the vectorizer needs no fit)"""
+        return self.vectorizer.transform(texts)
+
     def calculate_semantic_score(self, resume_text: str, job_description: str) -> float:
+        # Vectors are L2-normalized, so cosine similarity is a plain dot product
         try:
-            documents = [resume_text, job_description]
-            tfidf_matrix = self.vectorizer.fit_transform(documents)
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+            matrix = self.vectorize_corpus([resume_text, job_description])
+            similarity = (matrix[0] @ matrix[1].T)[0, 0]
             return float(similarity)
         except Exception:
             return 0.0
 
-    def calculate_overall_score(self, resume_data: Dict, job_requirements: Dict) -> Dict[str, float]:
-        resume_skills = resume_data.get('skills', [])
+    def calculate_semantic_scores(self, resume_texts: List[str], job_description: str) -> np.ndarray:
+        """Score every resume against one job with a single sparse product"""
+        try:
+            matrix = self.vectorize_corpus([job_description] + resume_texts)
+            return (matrix[1:] @ matrix[0].T).toarray().ravel()
+        except Exception:
+            return np.zeros(len(resume_texts))
+
+    def score_batch(self, resume_texts: List[str], job_descriptions: List[str]) -> np.ndarray:
+        """Similarity of every resume (rows) to every job description (columns)"""
+        if not resume_texts or not job_descriptions:
+            return np.zeros((len(resume_texts), len(job_descriptions)))
+        matrix = self.vectorize_corpus(resume_texts + job_descriptions)
+        resume_matrix = matrix[:len(resume_texts)]
+        job_matrix = matrix[len(resume_texts):]
+        return (resume_matrix @ job_matrix.T).toarray()
+
+    def calculate_overall_score(self, resume_data: Dict, job_requirements: Dict, semantic_score: float = None) -> Dict[str, float]:
+        # Parsed resumes store skills as {'skill': ..., 'category': ...} dicts
+        resume_skills = [s['skill'] if isinstance(s, dict) else s for s in resume_data.get('skills', [])]
         required_skills = job_requirements.get('required_skills', [])
         preferred_skills = job_requirements.get('preferred_skills', [])
         candidate_experience = resume_data.get('years_experience', 0)
@@ -90,7 +146,8 @@ class MatchingEngine:
         skill_score = self.calculate_skill_score(resume_skills, required_skills, preferred_skills)
         experience_score = self.calculate_experience_score(candidate_experience, required_experience)
         education_score = self.calculate_education_score(candidate_education, required_education)
-        semantic_score = self.calculate_semantic_score(resume_text, job_description)
+        if semantic_score is None:
+            semantic_score = self.calculate_semantic_score(resume_text, job_description)
 
         overall_score = (skill_score * self.weights['skills'] +
                          experience_score * self.weights['experience'] +
@@ -106,6 +163,92 @@ class MatchingEngine:
             'semantic_score': semantic_score
         }
 
+    def _component_scores(self, resumes: List[Dict], job_requirements: Dict,
+                          semantic_scores: np.ndarray = None) -> np.ndarray:
+        """Skills, experience, education and semantic scores as an N x 4 array"""
+        n = len(resumes)
+        if semantic_scores is None:
+            semantic = self.calculate_semantic_scores(
+                [resume.get('raw_text', '') for resume in resumes],
+                job_requirements.get('description', '')
+            )
+        else:
+            semantic = np.asarray(semantic_scores, dtype=float)
+
+        required_lower = [s.lower() for s in job_requirements.get('required_skills', [])]
+        preferred_lower = [s.lower() for s in job_requirements.get('preferred_skills', [])]
+        skills = np.fromiter((
+            self._skill_score(
+                frozenset((s['skill'] if isinstance(s, dict) else s).lower() for s in resume.get('skills', [])),
+                required_lower, preferred_lower
+            )
+            for resume in resumes
+        ), dtype=float, count=n)
+
+        candidate_experience = np.fromiter(
+            (resume.get('years_experience', 0) for resume in resumes), dtype=float, count=n
+        )
+        experience = self.calculate_experience_score_batch(
+            candidate_experience, job_requirements.get('min_experience', 0)
+        )
+
+        # Education: full credit at or above the requirement, 0.7 one level below,
+        # 0.4 further below and nothing when the level is unknown
+        required_level = self.education_levels.get(
+            job_requirements.get('education_requirement', 'not_specified').lower(), 0
+        )
+        candidate_level = np.fromiter(
+            (self.education_levels.get(resume.get('education_level', 'unknown').lower(), 0) for resume in resumes),
+            dtype=float, count=n
+        )
+        if required_level == 0:
+            education = np.ones(n)
+        else:
+            education = np.select(
+                [candidate_level >= required_level, candidate_level == required_level - 1, candidate_level > 0],
+                [1.0, 0.7, 0.4], 0.0
+            )
+
+        return np.column_stack([skills, experience, education, semantic])
+
+    def score_many(self, resumes: List[Dict], job_requirements: Dict,
+                   semantic_scores: np.ndarray = None) -> np.ndarray:
+        """Overall score of every resume for one job"""
+        return self._weighted_total(self._component_scores(resumes, job_requirements, semantic_scores))
+
+    def _weighted_total(self, scores: np.ndarray) -> np.ndarray:
+        weights = np.array([self.weights['skills'], self.weights['experience'],
+                            self.weights['education'], self.weights['semantic']])
+        if _batch_score is not None:
+            return _batch_score(scores[:, 0], scores[:, 1], scores[:, 2], scores[:, 3], weights)
+        return np.minimum(scores @ weights, 1.0)
+
+    def rank_resumes_batch(self, resumes: List[Dict], job_requirements: Dict,
+                           semantic_scores: np.ndarray = None) -> RankingBatch:
+        # semantic_scores may be a column of a precomputed score_batch matrix
+        scores = self._component_scores(resumes, job_requirements, semantic_scores)
+        overall = self._weighted_total(scores)
+
+        order = np.argsort(-overall, kind='stable')
+        ranked = scores[order]
+        return RankingBatch(order, overall[order], ranked[:, 0], ranked[:, 1],
+                            ranked[:, 2], ranked[:, 3])
+
+    def rank_resumes(self, resumes: List[Dict], job_requirements: Dict) -> List[Tuple[Dict, Dict[str, float], int]]:
+        batch = self.rank_resumes_batch(resumes, job_requirements)
+        columns = zip(batch.indices.tolist(), batch.overall.tolist(), batch.skills.tolist(),
+                      batch.experience.tolist(), batch.education.tolist(), batch.semantic.tolist())
+        return [
+            (resumes[i], {
+                'overall_score': overall,
+                'skill_score': skill,
+                'experience_score': experience,
+                'education_score': education,
+                'semantic_score': semantic
+            }, rank)
+            for rank, (i, overall, skill, experience, education, semantic) in enumerate(columns, start=1)
+        ]
+
     def generate_match_explanations(self, scores: Dict[str, float]) -> str:
         explanations = []
         # Skill explanation
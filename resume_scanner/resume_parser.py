@@ -3,15 +3,24 @@ Resume Parser Module
 Extracts text and structured information from resume files
 """
 
+import io
 import re
+from concurrent.futures import ProcessPoolExecutor
 import PyPDF2
 import docx
 from pathlib import Path
 import json
 
+from resume_scanner._skills import SKILLS_BY_CATEGORY, SKILL_RANK, SKILL_TO_CATEGORY, find_skills
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
 class ResumeParser:
     def __init__(self):
-        self.skills_keywords = self._load_skills_keywords()
+        self.skills_keywords = SKILLS_BY_CATEGORY
         self.education_keywords = {
             'phd': ['phd', 'ph.d', 'doctorate', 'doctoral'],
             'masters': ['master', 'msc', 'ms', 'ma', 'mba', 'meng'],
@@ -19,55 +28,46 @@ class ResumeParser:
             'associate': ['associate', 'diploma'],
             'high_school': ['high school', 'secondary', 'ged']
         }
-    
-    def _load_skills_keywords(self):
-        """Load common technical skills"""
-        return {
-            'programming': [
-                'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php',
-                'swift', 'kotlin', 'go', 'rust', 'typescript', 'scala', 'r'
-            ],
-            'web': [
-                'html', 'css', 'react', 'angular', 'vue', 'node.js', 'django',
-                'flask', 'spring', 'asp.net', 'express', 'jquery', 'bootstrap'
-            ],
-            'database': [
-                'sql', 'mysql', 'postgresql', 'mongodb', 'oracle', 'redis',
-                'cassandra', 'dynamodb', 'sqlite', 'mariadb', 'nosql'
-            ],
-            'cloud': [
-                'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins',
-                'terraform', 'ansible', 'git', 'ci/cd', 'devops'
-            ],
-            'data_science': [
-                'machine learning', 'deep learning', 'nlp', 'tensorflow',
-                'pytorch', 'scikit-learn', 'pandas', 'numpy', 'matplotlib',
-                'tableau', 'power bi', 'spark', 'hadoop', 'data analysis'
-            ],
-            'soft_skills': [
-                'leadership', 'communication', 'teamwork', 'problem solving',
-                'analytical', 'project management', 'agile', 'scrum'
-            ]
-        }
+        
+        # Precompiled patterns reused by every parse
+        self._email_re = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+        self._phone_re = re.compile(r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+        self._experience_patterns = [re.compile(p) for p in [
+            r'(\d+)\+?\s*years?\s*(?:of)?\s*experience',
+            r'experience[:\s]*(\d+)\+?\s*years?',
+            r'(\d+)\+?\s*yrs?\s*(?:of)?\s*experience'
+        ]]
     
     def extract_text_from_pdf(self, file_path):
-        """Extract text from PDF file"""
+        """Extract text from PDF file (path, raw bytes or binary stream)"""
+        if isinstance(file_path, Path):
+            file_path = str(file_path)
         try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-            return text
+            if pdfium is not None:
+                # PDFium extracts text natively, far faster than PyPDF2, and
+                # loads raw bytes without a file-like wrapper
+                pdf = pdfium.PdfDocument(file_path)
+                try:
+                    return "\n".join(page.get_textpage().get_text_range() for page in pdf)
+                finally:
+                    pdf.close()
+            
+            if isinstance(file_path, bytes):
+                file_path = io.BytesIO(file_path)
+            return self._extract_text_pypdf2(file_path)
         except Exception as e:
             print(f"Error extracting PDF: {e}")
             return ""
     
+    def _extract_text_pypdf2(self, stream):
+        pdf_reader = PyPDF2.PdfReader(stream)
+        return "".join(page.extract_text() for page in pdf_reader.pages)
+    
     def extract_text_from_docx(self, file_path):
-        """Extract text from DOCX file"""
+        """Extract text from DOCX file (path or binary stream)"""
         try:
             doc = docx.Document(file_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+            text = "\n".join(paragraph.text for paragraph in doc.paragraphs)
             return text
         except Exception as e:
             print(f"Error extracting DOCX: {e}")
@@ -76,29 +76,32 @@ class ResumeParser:
     def extract_text(self, file_path):
         """Extract text from resume file"""
         file_path = Path(file_path)
-        if file_path.suffix.lower() == '.pdf':
-            return self.extract_text_from_pdf(file_path)
-        elif file_path.suffix.lower() in ['.docx', '.doc']:
-            return self.extract_text_from_docx(file_path)
+        return self.extract_text_from_bytes(file_path.read_bytes(), file_path.suffix)
+    
+    def extract_text_from_bytes(self, data, suffix):
+        """Extract text from resume contents already read into memory"""
+        suffix = suffix.lower()
+        if suffix == '.pdf':
+            return self.extract_text_from_pdf(data)
+        elif suffix in ['.docx', '.doc']:
+            return self.extract_text_from_docx(io.BytesIO(data))
         else:
-            raise ValueError(f"Unsupported file format: {file_path.suffix}")
+            raise ValueError(f"Unsupported file format: {suffix}")
     
     def extract_email(self, text):
         """Extract email address from text"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
+        emails = self._email_re.findall(text)
         return emails[0] if emails else None
     
     def extract_phone(self, text):
         """Extract phone number from text"""
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phones = re.findall(phone_pattern, text)
-        return phones[0] if phones else None
+        match = self._phone_re.search(text)
+        return match.group(0) if match else None
     
     def extract_name(self, text):
         """Extract candidate name (simple heuristic)"""
-        lines = text.split('\n')
-        for line in lines[:5]:
+        # Only the first five lines are examined, so stop splitting there
+        for line in text.split('\n', 5)[:5]:
             line = line.strip()
             if len(line) > 3 and len(line) < 50 and not '@' in line:
                 words = line.split()
@@ -106,65 +109,83 @@ class ResumeParser:
                     return line
         return "Unknown"
     
-    def extract_skills(self, text):
+    def extract_skills(self, text, text_lower=None):
         """Extract technical skills from resume text"""
-        text_lower = text.lower()
-        found_skills = []
+        if text_lower is None:
+            text_lower = text.lower()
+        matched = sorted(find_skills(text_lower), key=SKILL_RANK.__getitem__)
         
-        for category, skills in self.skills_keywords.items():
-            for skill in skills:
-                if skill.lower() in text_lower:
-                    found_skills.append({
-                        'skill': skill,
-                        'category': category
-                    })
-        
-        return found_skills
+        return [
+            {'skill': skill, 'category': SKILL_TO_CATEGORY[skill]}
+            for skill in matched
+        ]
     
-    def extract_experience(self, text):
+    def extract_experience(self, text, text_lower=None):
         """Extract years of experience"""
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of)?\s*experience',
-            r'experience[:\s]*(\d+)\+?\s*years?',
-            r'(\d+)\+?\s*yrs?\s*(?:of)?\s*experience'
-        ]
-        
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
+        # Every pattern needs 'year' or 'yr', so most texts skip the regexes
+        if 'year' not in text_lower and 'yr' not in text_lower:
+            return 0
         years = []
         
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text_lower)
+        for pattern in self._experience_patterns:
+            matches = pattern.findall(text_lower)
             years.extend([int(m) for m in matches])
         
         return max(years) if years else 0
     
-    def extract_education(self, text):
+    def extract_education(self, text, text_lower=None):
         """Extract highest education level"""
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         
+        # Keywords are plain substrings, so str.find beats a regex scan
         for level, keywords in self.education_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    return level
+            if any(keyword in text_lower for keyword in keywords):
+                return level
         
         return 'unknown'
     
     def parse_resume(self, file_path):
         """Parse resume and extract all information"""
-        text = self.extract_text(file_path)
+        file_path = Path(file_path)
+        return self.parse_resume_bytes(file_path.read_bytes(), file_path.suffix, file_path)
+    
+    def parse_resume_bytes(self, data, suffix, file_path=None):
+        """Parse resume contents already read into memory"""
+        text = self.extract_text_from_bytes(data, suffix)
+        text_lower = text.lower()
         
         resume_data = {
-            'file_path': str(file_path),
+            'file_path': str(file_path) if file_path else None,
             'raw_text': text,
             'candidate_name': self.extract_name(text),
             'email': self.extract_email(text),
             'phone': self.extract_phone(text),
-            'skills': self.extract_skills(text),
-            'years_experience': self.extract_experience(text),
-            'education_level': self.extract_education(text)
+            'skills': self.extract_skills(text, text_lower),
+            'years_experience': self.extract_experience(text, text_lower),
+            'education_level': self.extract_education(text, text_lower)
         }
         
         return resume_data
+    
+    def _parse_resume_or_none(self, file_path):
+        """Parse a resume, reporting failures instead of raising"""
+        try:
+            return self.parse_resume(file_path)
+        except Exception as e:
+            print(f"Error processing {file_path}: {e}")
+            return None
+    
+    def iter_parse_resumes(self, file_paths, max_workers=None, chunksize=8):
+        """Yield parsed resumes in input order, parsing them in worker processes"""
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            yield from executor.map(self._parse_resume_or_none, file_paths, chunksize=chunksize)
+    
+    def parse_resumes(self, file_paths, max_workers=None, chunksize=8):
+        """Parse many resumes in parallel; failed files come back as None"""
+        return list(self.iter_parse_resumes(file_paths, max_workers, chunksize))
 
 if __name__ == "__main__":
     # Example usage
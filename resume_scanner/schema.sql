@@ -21,6 +21,7 @@ CREATE TABLE IF NOT EXISTS resumes (
     extractedskills TEXT,
     yearsexperience REAL,
     educationlevel TEXT,
+    contenthash INTEGER,
     createdat DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -30,6 +31,11 @@ CREATE TABLE IF NOT EXISTS resumerankings (
     jobid INTEGER,
     resumeid INTEGER,
     score REAL,
+    skillsscore REAL,
+    experiencescore REAL,
+    educationscore REAL,
+    semanticscore REAL,
+    rankposition INTEGER,
     details TEXT,
     createdat DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (jobid) REFERENCES jobpostings(jobid),
@@ -46,3 +52,26 @@ CREATE TABLE IF NOT EXISTS jobskills (
     FOREIGN KEY (jobid) REFERENCES jobpostings(jobid)
 );
 
+-- Table for skills extracted from each resume
+CREATE TABLE IF NOT EXISTS candidateskills (
+    skillid INTEGER PRIMARY KEY AUTOINCREMENT,
+    resumeid INTEGER,
+    skillname TEXT NOT NULL,
+    category TEXT,
+    FOREIGN KEY (resumeid) REFERENCES resumes(resumeid)
+);
+
+-- Cache of parsed resumes keyed by the SHA-256 of the file contents
+CREATE TABLE IF NOT EXISTS resumecache (
+    filehash TEXT PRIMARY KEY,
+    parsedjson TEXT NOT NULL,
+    createdat DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Indexes for per-job top-N ranking queries
+CREATE INDEX IF NOT EXISTS idx_rankings_job_rank ON resumerankings(jobid, rankposition);
+CREATE INDEX IF NOT EXISTS idx_rankings_job_score ON resumerankings(jobid, score DESC);
+
+-- Duplicate detection: one resume per normalized text hash, one row per skill
+CREATE UNIQUE INDEX IF NOT EXISTS idx_resume_hash ON resumes(contenthash);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_candidateskills_resume_skill ON candidateskills(resumeid, skillname);